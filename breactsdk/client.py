@@ -1,15 +1,156 @@
-import os
+import sys
+import json
+import math
 import time
+import functools
+import random
 import asyncio
 import httpx
 import logging
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from pydantic import TypeAdapter
+from pydantic_core import PydanticSerializationError, from_json, to_json
 from .config import Configuration
 
-# Set up logging with default level
-logging.basicConfig(level=logging.INFO)
+# Library code only creates its logger; configuring handlers and levels is
+# left to the application
 logger = logging.getLogger(__name__)
 
+# Connection pool limits for the underlying httpx clients. Polling issues a
+# request every few seconds per outstanding job, so keeping a warm pool of
+# keep-alive connections avoids a fresh TCP/TLS handshake on each call.
+DEFAULT_LIMITS = httpx.Limits(
+    max_keepalive_connections=64,
+    max_connections=128,
+    keepalive_expiry=60.0,
+)
+
+# Service and poll responses are JSON objects. Validating them straight from
+# the raw body lets pydantic-core parse and check them in one native pass
+# instead of going through the stdlib json module.
+_RESPONSE_ADAPTER = TypeAdapter(Dict[str, Any])
+
+def _parse_response(response: httpx.Response) -> dict:
+    """Raise for HTTP error statuses and decode a JSON object response body."""
+    response.raise_for_status()
+    return _RESPONSE_ADAPTER.validate_json(response.content)
+
+@functools.lru_cache(maxsize=1024)
+def _service_path(service_id: str, endpoint: str) -> str:
+    """Build (once per service/endpoint pair) the path of a service endpoint."""
+    return sys.intern(f"/services/{service_id}/{endpoint}")
+
+def _extract_result(data: dict) -> Any:
+    """Unwrap the payload of a completed service response."""
+    if "result" in data:
+        return data["result"]
+    if "data" in data:
+        return data["data"]
+    return data
+
+# Extra time allowed on top of the long-poll window before a poll request
+# is considered timed out.
+LONG_POLL_MARGIN = 5.0
+
+# First delay between polls; doubles on every attempt up to the poll interval.
+POLL_BASE_DELAY = 0.1
+
+def _next_poll_delay(
+    attempt: int, poll_interval: float, remaining: float, response: httpx.Response, result: dict
+) -> float:
+    """
+    Compute how long to wait before the next poll.
+
+    A finite server-supplied ``Retry-After`` header or ``poll_after`` field
+    takes precedence, clamped to the ``remaining`` time before the deadline.
+    Otherwise back off exponentially from POLL_BASE_DELAY, capped at
+    poll_interval but never below POLL_BASE_DELAY so a zero interval cannot
+    busy-loop, with jitter so concurrent pollers do not synchronize.
+    """
+    for hint in (response.headers.get("Retry-After"), result.get("poll_after")):
+        if hint is not None:
+            try:
+                delay = float(hint)
+            except (TypeError, ValueError):
+                continue
+            if math.isfinite(delay):
+                return min(max(0.0, delay), max(0.0, remaining))
+    # Clamp the exponent so long-running polls cannot overflow the float range
+    delay = min(max(poll_interval, POLL_BASE_DELAY), POLL_BASE_DELAY * 2 ** min(attempt, 32))
+    return delay * random.uniform(0.8, 1.2)
+
+@functools.lru_cache(maxsize=None)
+def _long_poll_timeout(wait: int) -> httpx.Timeout:
+    """Timeout for a poll request the server may hold open for ``wait`` seconds."""
+    return httpx.Timeout(5.0, read=wait + LONG_POLL_MARGIN)
+
+def _poll_request_options(access_token: str, long_poll_wait: float, remaining: float):
+    """
+    Build the query parameters and timeout for a single poll request.
+
+    With long polling the server may hold the request open for up to ``wait``
+    seconds and answer as soon as the job finishes, so the read timeout is
+    extended to cover that window. Servers that ignore ``wait`` answer
+    immediately and polling falls back to the regular backoff.
+    """
+    params = {"access_token": access_token}
+    wait = int(min(long_poll_wait, remaining))
+    if wait <= 0:
+        return params, httpx.USE_CLIENT_DEFAULT
+    params["wait"] = wait
+    return params, _long_poll_timeout(wait)
+
+class _ResponseCache:
+    """
+    TTL cache of completed service results, keyed by (service_id, endpoint, params).
+
+    Cached results are shared between callers and must not be mutated.
+    """
+    __slots__ = ("ttl", "maxsize", "_entries")
+
+    MISSING = object()
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[tuple, Tuple[float, Any]] = {}
+
+    @staticmethod
+    def key(service_id: str, endpoint: str, params: dict) -> Optional[tuple]:
+        """
+        Build a cache key that does not depend on the order of params keys.
+
+        The key is derived from the request body as it is sent (``to_json``),
+        re-encoded with sorted keys, so two calls share a key only when they
+        send the same JSON. Returns None, leaving the call uncached, when params
+        cannot be serialized.
+        """
+        try:
+            body = to_json(params)
+        except PydanticSerializationError:
+            return None
+        return (service_id, endpoint, json.dumps(from_json(body), sort_keys=True, separators=(",", ":")))
+
+    def get(self, key: tuple) -> Any:
+        """Return the cached result for key, or MISSING if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return self.MISSING
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return self.MISSING
+        return entry[1]
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Store a result, evicting expired and then oldest entries when full."""
+        now = time.monotonic()
+        if len(self._entries) >= self.maxsize:
+            for stale in [k for k, (expires, _) in self._entries.items() if expires < now]:
+                del self._entries[stale]
+            while len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + self.ttl, value)
+
 class ServiceProxy:
     """A proxy class that allows dynamic access to service endpoints."""
     def __init__(self, client, service_id: str):
@@ -27,34 +168,57 @@ class ServiceProxy:
         def _sync_execute(**params):
             return self._client.execute_service(self._service_id, endpoint, params)
 
-        # Return async or sync version based on client type
-        return _async_execute if isinstance(self._client, AsyncBReactClient) else _sync_execute
+        # Return async or sync version based on client type, caching it on the
+        # instance so later lookups of the same endpoint bypass __getattr__
+        method = _async_execute if isinstance(self._client, AsyncBReactClient) else _sync_execute
+        setattr(self, endpoint, method)
+        return method
 
 class AsyncBReactClient:
-    def __init__(self, api_key: str = None, base_url: str = None):
+    __slots__ = ("config", "client", "_service_cache", "_response_cache", "_inflight", "__weakref__")
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        response_cache_ttl: float = 0,
+        http2: bool = True,
+        limits: Optional[httpx.Limits] = None,
+    ):
         """
         Initialize the asynchronous BReact client.
 
         :param api_key: API key; if not provided, use the one from config
         :param base_url: Base URL for the API; if not provided, use the one from config
+        :param response_cache_ttl: Seconds to reuse results of identical service calls (0 disables caching)
+        :param http2: If True, multiplex concurrent requests over a single HTTP/2 connection
+        :param limits: Connection pool limits; defaults to DEFAULT_LIMITS
         """
         self.config = Configuration(api_key=api_key, base_url=base_url)
         self.client = httpx.AsyncClient(
             headers={
                 "Content-Type": "application/json",
                 "x-api-key": self.config.api_key,
-            }
+            },
+            limits=limits or DEFAULT_LIMITS,
+            http2=http2,
         )
         self._service_cache = {}
+        self._response_cache = _ResponseCache(response_cache_ttl) if response_cache_ttl > 0 else None
+        # Identical calls already in flight, so concurrent callers share one request
+        self._inflight: Dict[tuple, asyncio.Task] = {}
 
     def __getattr__(self, service_id: str) -> ServiceProxy:
         """
         Dynamically create a ServiceProxy for the requested service.
         This allows users to access services like: client.service_name
         """
-        if service_id not in self._service_cache:
-            self._service_cache[service_id] = ServiceProxy(self, service_id)
-        return self._service_cache[service_id]
+        proxy = self._service_cache.get(service_id)
+        if proxy is None:
+            # Proxies are built with no await point, so concurrent coroutines
+            # cannot interleave here and each service gets a single proxy.
+            proxy = self._service_cache.setdefault(service_id, ServiceProxy(self, service_id))
+        return proxy
 
     @property
     def services(self):
@@ -68,7 +232,7 @@ class AsyncBReactClient:
         :return: Dictionary containing available services
         """
         url = f"{self.config.api_base_url}/services"
-        logger.debug(f"Making request to {url}")
+        logger.debug("Making request to %s", url)
         
         response = await self.client.get(url)
         response.raise_for_status()
@@ -90,36 +254,115 @@ class AsyncBReactClient:
         :param endpoint: The endpoint to call (e.g., "process")
         :param params: Request payload (including content, context, config, etc.)
         :param wait_for_result: If True, automatically poll until the result is ready
-        :param poll_interval: Seconds between polls (overrides config value)
+        :param poll_interval: Maximum seconds between polls (overrides config value)
         :param timeout: Maximum seconds to wait for completion (overrides config value)
         :return: The final result data, or process details if wait_for_result is False
         """
-        url = f"{self.config.api_base_url}/services/{service_id}/{endpoint}"
-        logger.debug(f"Making request to {url} with params: {params}")
+        if self._response_cache is None or not wait_for_result:
+            return await self._execute_service(service_id, endpoint, params, wait_for_result, poll_interval, timeout)
+
+        key = _ResponseCache.key(service_id, endpoint, params)
+        if key is None:
+            return await self._execute_service(service_id, endpoint, params, True, poll_interval, timeout)
+        cached = self._response_cache.get(key)
+        if cached is not _ResponseCache.MISSING:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._execute_and_cache(key, service_id, endpoint, params, poll_interval, timeout)
+            )
+            self._inflight[key] = task
+        # Shield the shared call so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _execute_and_cache(
+        self,
+        key: tuple,
+        service_id: str,
+        endpoint: str,
+        params: dict,
+        poll_interval: Optional[float],
+        timeout: Optional[float],
+    ) -> Any:
+        """Run a service call to completion and store its result in the response cache."""
+        try:
+            result = await self._execute_service(service_id, endpoint, params, True, poll_interval, timeout)
+            self._response_cache.put(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _execute_service(
+        self,
+        service_id: str,
+        endpoint: str,
+        params: dict,
+        wait_for_result: bool,
+        poll_interval: Optional[float],
+        timeout: Optional[float],
+    ) -> Any:
+        """Submit a service call and poll for its result, bypassing the response cache."""
+        url = self.config.api_base_url + _service_path(service_id, endpoint)
+        logger.debug("Making request to %s with params: %s", url, params)
         
-        response = await self.client.post(url, json=params)
-        response.raise_for_status()
-        data = response.json()
-        logger.debug(f"Initial response: {data}")
+        # The Content-Type header is set on the client; serialize the body with
+        # pydantic-core rather than the stdlib json encoder httpx would use.
+        response = await self.client.post(url, content=to_json(params))
+        data = _parse_response(response)
+        logger.debug("Initial response: %s", data)
 
         process_id = data.get("process_id")
         access_token = data.get("access_token")
         if not process_id or not access_token:
             # If no process_id/access_token, this might be a direct response
-            if "result" in data:
-                return data["result"]
-            if "data" in data:
-                return data["data"]
-            return data
+            return _extract_result(data)
 
         if not wait_for_result:
             return {"process_id": process_id, "access_token": access_token}
 
+        if data.get("status") == "completed":
+            # Fast services may finish before the submission returns; skip polling
+            return _extract_result(data)
+
         return await self.poll_result(
             process_id, 
             access_token, 
-            poll_interval or self.config.poll_interval,
-            timeout or self.config.timeout
+            poll_interval if poll_interval is not None else self.config.poll_interval,
+            timeout if timeout is not None else self.config.timeout
+        )
+
+    async def execute_batch(
+        self,
+        requests: Iterable[Tuple[str, str, dict]],
+        max_concurrency: int = 32,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Execute many service calls concurrently with bounded parallelism.
+
+        At most ``max_concurrency`` calls (submission plus polling) are in flight
+        at once, so large batches do not exhaust the connection pool or trip
+        server rate limits. Keep it at or below the pool's ``max_connections``.
+
+        :param requests: Iterable of (service_id, endpoint, params) tuples
+        :param max_concurrency: Maximum number of calls in flight at once
+        :param return_exceptions: If True, failed calls return their exception instead of aborting the batch
+        :return: Results in the same order as the input requests
+        :raises ValueError: if max_concurrency is less than 1
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _execute(service_id: str, endpoint: str, params: dict):
+            async with semaphore:
+                return await self.execute_service(service_id, endpoint, params)
+
+        return await asyncio.gather(
+            *(_execute(*request) for request in requests),
+            return_exceptions=return_exceptions,
         )
 
     async def poll_result(
@@ -134,35 +377,42 @@ class AsyncBReactClient:
 
         :param process_id: The process identifier
         :param access_token: The access token
-        :param poll_interval: Seconds between polls (overrides config value)
+        :param poll_interval: Maximum seconds between polls (overrides config value)
         :param timeout: Maximum seconds to wait (overrides config value)
         :return: The final result data
         :raises TimeoutError: if polling times out
         """
         start_time = time.time()
-        poll_url = f"{self.config.api_base_url}/services/result/{process_id}?access_token={access_token}"
-        logger.debug(f"Polling URL: {poll_url}")
+        poll_url = f"{self.config.api_base_url}/services/result/{process_id}"
+        logger.debug("Polling URL: %s", poll_url)
 
-        poll_interval = poll_interval or self.config.poll_interval
-        timeout = timeout or self.config.timeout
+        poll_interval = poll_interval if poll_interval is not None else self.config.poll_interval
+        timeout = timeout if timeout is not None else self.config.timeout
 
+        attempt = 0
+        request = request_params = None
         while True:
-            response = await self.client.get(poll_url)
-            response.raise_for_status()
-            result = response.json()
-            logger.debug(f"Poll response: {result}")
+            params, request_timeout = _poll_request_options(
+                access_token, self.config.long_poll_wait, timeout - (time.time() - start_time)
+            )
+            # Build the poll request once and resend it; it only changes when the
+            # long-poll window shrinks near the overall timeout
+            if params != request_params:
+                request = self.client.build_request("GET", poll_url, params=params, timeout=request_timeout)
+                request_params = params
+            response = await self.client.send(request)
+            result = _parse_response(response)
+            logger.debug("Poll response: %s", result)
 
             if result.get("status") == "completed":
-                if "result" in result:
-                    return result["result"]
-                if "data" in result:
-                    return result["data"]
-                return result
+                return _extract_result(result)
 
             if time.time() - start_time > timeout:
                 raise TimeoutError("Polling timed out waiting for the result.")
 
-            await asyncio.sleep(poll_interval)
+            remaining = timeout - (time.time() - start_time)
+            await asyncio.sleep(_next_poll_delay(attempt, poll_interval, remaining, response, result))
+            attempt += 1
 
     async def close(self):
         """Close the asynchronous HTTP client."""
@@ -177,30 +427,48 @@ class AsyncBReactClient:
         await self.close()
 
 class SyncBReactClient:
-    def __init__(self, api_key: str = None, base_url: str = None):
+    __slots__ = ("config", "client", "_service_cache", "_response_cache", "__weakref__")
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        response_cache_ttl: float = 0,
+        http2: bool = True,
+        limits: Optional[httpx.Limits] = None,
+    ):
         """
         Initialize the synchronous BReact client.
 
         :param api_key: API key; if not provided, use the one from config
         :param base_url: Base URL for the API; if not provided, use the one from config
+        :param response_cache_ttl: Seconds to reuse results of identical service calls (0 disables caching)
+        :param http2: If True, multiplex concurrent requests over a single HTTP/2 connection
+        :param limits: Connection pool limits; defaults to DEFAULT_LIMITS
         """
         self.config = Configuration(api_key=api_key, base_url=base_url)
         self.client = httpx.Client(
             headers={
                 "Content-Type": "application/json",
                 "x-api-key": self.config.api_key,
-            }
+            },
+            limits=limits or DEFAULT_LIMITS,
+            http2=http2,
         )
         self._service_cache = {}
+        self._response_cache = _ResponseCache(response_cache_ttl) if response_cache_ttl > 0 else None
 
     def __getattr__(self, service_id: str) -> ServiceProxy:
         """
         Dynamically create a ServiceProxy for the requested service.
         This allows users to access services like: client.service_name
         """
-        if service_id not in self._service_cache:
-            self._service_cache[service_id] = ServiceProxy(self, service_id)
-        return self._service_cache[service_id]
+        proxy = self._service_cache.get(service_id)
+        if proxy is None:
+            # setdefault keeps a single proxy per service when threads share
+            # a sync client.
+            proxy = self._service_cache.setdefault(service_id, ServiceProxy(self, service_id))
+        return proxy
 
     @property
     def services(self):
@@ -214,7 +482,7 @@ class SyncBReactClient:
         :return: Dictionary containing available services
         """
         url = f"{self.config.api_base_url}/services"
-        logger.debug(f"Making request to {url}")
+        logger.debug("Making request to %s", url)
         
         response = self.client.get(url)
         response.raise_for_status()
@@ -236,36 +504,59 @@ class SyncBReactClient:
         :param endpoint: The endpoint to call (e.g., "process")
         :param params: Request payload
         :param wait_for_result: If True, block until the final result is obtained
-        :param poll_interval: Seconds between polls (overrides config value)
+        :param poll_interval: Maximum seconds between polls (overrides config value)
         :param timeout: Maximum seconds to wait for the result (overrides config value)
         :return: Final result data, or process details if wait_for_result is False
         """
-        url = f"{self.config.api_base_url}/services/{service_id}/{endpoint}"
-        logger.debug(f"Making request to {url} with params: {params}")
+        if self._response_cache is None or not wait_for_result:
+            return self._execute_service(service_id, endpoint, params, wait_for_result, poll_interval, timeout)
+
+        key = _ResponseCache.key(service_id, endpoint, params)
+        if key is None:
+            return self._execute_service(service_id, endpoint, params, True, poll_interval, timeout)
+        cached = self._response_cache.get(key)
+        if cached is not _ResponseCache.MISSING:
+            return cached
+
+        result = self._execute_service(service_id, endpoint, params, True, poll_interval, timeout)
+        self._response_cache.put(key, result)
+        return result
+
+    def _execute_service(
+        self,
+        service_id: str,
+        endpoint: str,
+        params: dict,
+        wait_for_result: bool,
+        poll_interval: Optional[float],
+        timeout: Optional[float],
+    ) -> Any:
+        """Submit a service call and poll for its result, bypassing the response cache."""
+        url = self.config.api_base_url + _service_path(service_id, endpoint)
+        logger.debug("Making request to %s with params: %s", url, params)
         
-        response = self.client.post(url, json=params)
-        response.raise_for_status()
-        data = response.json()
-        logger.debug(f"Initial response: {data}")
+        response = self.client.post(url, content=to_json(params))
+        data = _parse_response(response)
+        logger.debug("Initial response: %s", data)
 
         process_id = data.get("process_id")
         access_token = data.get("access_token")
         if not process_id or not access_token:
             # If no process_id/access_token, this might be a direct response
-            if "result" in data:
-                return data["result"]
-            if "data" in data:
-                return data["data"]
-            return data
+            return _extract_result(data)
 
         if not wait_for_result:
             return {"process_id": process_id, "access_token": access_token}
 
+        if data.get("status") == "completed":
+            # Fast services may finish before the submission returns; skip polling
+            return _extract_result(data)
+
         return self.poll_result(
             process_id, 
             access_token, 
-            poll_interval or self.config.poll_interval,
-            timeout or self.config.timeout
+            poll_interval if poll_interval is not None else self.config.poll_interval,
+            timeout if timeout is not None else self.config.timeout
         )
 
     def poll_result(
@@ -280,35 +571,42 @@ class SyncBReactClient:
 
         :param process_id: The process identifier
         :param access_token: The access token
-        :param poll_interval: Seconds between polls (overrides config value)
+        :param poll_interval: Maximum seconds between polls (overrides config value)
         :param timeout: Maximum seconds to wait for completion (overrides config value)
         :return: The final result data
         :raises TimeoutError: if the result is not available within the timeout
         """
         start_time = time.time()
-        poll_url = f"{self.config.api_base_url}/services/result/{process_id}?access_token={access_token}"
-        logger.debug(f"Polling URL: {poll_url}")
+        poll_url = f"{self.config.api_base_url}/services/result/{process_id}"
+        logger.debug("Polling URL: %s", poll_url)
 
-        poll_interval = poll_interval or self.config.poll_interval
-        timeout = timeout or self.config.timeout
+        poll_interval = poll_interval if poll_interval is not None else self.config.poll_interval
+        timeout = timeout if timeout is not None else self.config.timeout
 
+        attempt = 0
+        request = request_params = None
         while True:
-            response = self.client.get(poll_url)
-            response.raise_for_status()
-            result = response.json()
-            logger.debug(f"Poll response: {result}")
+            params, request_timeout = _poll_request_options(
+                access_token, self.config.long_poll_wait, timeout - (time.time() - start_time)
+            )
+            # Build the poll request once and resend it; it only changes when the
+            # long-poll window shrinks near the overall timeout
+            if params != request_params:
+                request = self.client.build_request("GET", poll_url, params=params, timeout=request_timeout)
+                request_params = params
+            response = self.client.send(request)
+            result = _parse_response(response)
+            logger.debug("Poll response: %s", result)
 
             if result.get("status") == "completed":
-                if "result" in result:
-                    return result["result"]
-                if "data" in result:
-                    return result["data"]
-                return result
+                return _extract_result(result)
 
             if time.time() - start_time > timeout:
                 raise TimeoutError("Polling timed out waiting for the result.")
 
-            time.sleep(poll_interval)
+            remaining = timeout - (time.time() - start_time)
+            time.sleep(_next_poll_delay(attempt, poll_interval, remaining, response, result))
+            attempt += 1
 
     def close(self):
         """Close the synchronous HTTP client."""
@@ -326,7 +624,10 @@ class SyncBReactClient:
 def create_client(
     api_key: Optional[str] = None,
     base_url: Optional[str] = None,
-    async_client: bool = False
+    async_client: bool = False,
+    response_cache_ttl: float = 0,
+    http2: bool = True,
+    limits: Optional[httpx.Limits] = None
 ) -> Union[AsyncBReactClient, SyncBReactClient]:
     """
     Create a BReact client instance.
@@ -334,7 +635,16 @@ def create_client(
     :param api_key: Optional API key (overrides config and env var)
     :param base_url: Base URL for the API (overrides config and env var)
     :param async_client: If True, return an AsyncBReactClient, otherwise return a SyncBReactClient
+    :param response_cache_ttl: Seconds to reuse results of identical service calls (0 disables caching)
+    :param http2: If True, multiplex concurrent requests over a single HTTP/2 connection
+    :param limits: Connection pool limits; defaults to DEFAULT_LIMITS
     :return: A configured client instance
     """
     client_class = AsyncBReactClient if async_client else SyncBReactClient
-    return client_class(api_key=api_key, base_url=base_url)
+    return client_class(
+        api_key=api_key,
+        base_url=base_url,
+        response_cache_ttl=response_cache_ttl,
+        http2=http2,
+        limits=limits,
+    )
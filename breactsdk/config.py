@@ -8,17 +8,26 @@ import logging
 from typing import Optional, Union
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv(override=True)
+# Load environment variables from .env file once per process tree; reloads of
+# this module and child processes inherit the already-populated environment
+if not os.getenv("BREACT_DOTENV_LOADED"):
+    load_dotenv(override=True)
+    os.environ["BREACT_DOTENV_LOADED"] = "1"
 
 class Configuration:
     """Central configuration class for the BReact SDK."""
+
+    __slots__ = (
+        "api_key", "base_url", "api_version", "timeout",
+        "poll_interval", "long_poll_wait", "log_level", "__weakref__",
+    )
     
     # Default values
     DEFAULT_BASE_URL = "https://api-os.breact.ai"
     DEFAULT_API_VERSION = "v1"
     DEFAULT_TIMEOUT = 30.0
     DEFAULT_POLL_INTERVAL = 1.0
+    DEFAULT_LONG_POLL_WAIT = 25.0
     DEFAULT_LOG_LEVEL = logging.INFO
     
     def __init__(
@@ -28,6 +37,7 @@ class Configuration:
         api_version: Optional[str] = None,
         timeout: Optional[float] = None,
         poll_interval: Optional[float] = None,
+        long_poll_wait: Optional[float] = None,
         log_level: Optional[Union[int, str]] = None
     ):
         """
@@ -38,6 +48,7 @@ class Configuration:
         :param api_version: API version to use
         :param timeout: Default timeout for requests
         :param poll_interval: Default polling interval
+        :param long_poll_wait: Seconds the server may hold a poll request open (0 disables long polling)
         :param log_level: Logging level (e.g., 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
         """
         self.api_key = api_key or os.getenv("BREACT_API_KEY")
@@ -57,18 +68,25 @@ class Configuration:
             self.DEFAULT_API_VERSION
         )
         
+        # Compare against None so an explicit 0 is not replaced by the default
         self.timeout = float(
-            timeout or 
-            os.getenv("BREACT_TIMEOUT") or 
+            timeout if timeout is not None else
+            os.getenv("BREACT_TIMEOUT") or
             self.DEFAULT_TIMEOUT
         )
         
         self.poll_interval = float(
-            poll_interval or 
-            os.getenv("BREACT_POLL_INTERVAL") or 
+            poll_interval if poll_interval is not None else
+            os.getenv("BREACT_POLL_INTERVAL") or
             self.DEFAULT_POLL_INTERVAL
         )
 
+        self.long_poll_wait = float(
+            long_poll_wait if long_poll_wait is not None else
+            os.getenv("BREACT_LONG_POLL_WAIT") or
+            self.DEFAULT_LONG_POLL_WAIT
+        )
+
         # Handle log level configuration
         self.log_level = self._parse_log_level(
             log_level or 
@@ -97,6 +115,7 @@ class Configuration:
         api_version: Optional[str] = None,
         timeout: Optional[float] = None,
         poll_interval: Optional[float] = None,
+        long_poll_wait: Optional[float] = None,
         log_level: Optional[Union[int, str]] = None
     ) -> None:
         """
@@ -107,6 +126,7 @@ class Configuration:
         :param api_version: New API version
         :param timeout: New timeout value
         :param poll_interval: New polling interval
+        :param long_poll_wait: New long-poll wait window
         :param log_level: New logging level
         """
         if api_key is not None:
@@ -119,5 +139,7 @@ class Configuration:
             self.timeout = float(timeout)
         if poll_interval is not None:
             self.poll_interval = float(poll_interval)
+        if long_poll_wait is not None:
+            self.long_poll_wait = float(long_poll_wait)
         if log_level is not None:
             self.log_level = self._parse_log_level(log_level) 
\ No newline at end of file
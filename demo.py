@@ -207,18 +207,19 @@ async def demo_concurrent_processing():
     """Demonstrate concurrent processing of multiple requests."""
     print("\n=== Concurrent Processing Demo ===")
     async with create_client(async_client=True) as client:
-        # Process multiple texts concurrently
-        tasks = [
-            client.summary.summarize(
-                text=f"Part {i} of the text: {SAMPLE_TEXT}",
-                summary_type="executive",
-                model_id="mistral-small"
-            ) for i in range(3)
-        ]
+        # Process multiple texts concurrently; the task group cancels the
+        # remaining requests if one of them fails
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(client.summary.summarize(
+                    text=f"Part {i} of the text: {SAMPLE_TEXT}",
+                    summary_type="executive",
+                    model_id="mistral-small"
+                )) for i in range(3)
+            ]
         
-        results = await asyncio.gather(*tasks)
-        for i, result in enumerate(results):
-            print(f"\nSummary {i + 1}: {result}")
+        for i, task in enumerate(tasks):
+            print(f"\nSummary {i + 1}: {task.result()}")
 
 async def main():
     """Run all demos."""
@@ -4,97 +4,191 @@ Email Management Workflow - An agent that orchestrates BReact OS services
 to analyze, classify, and generate responses to emails.
 """
 
-import os
-import json
 import asyncio
+import hashlib
 import logging
-import argparse
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import functools
+import collections
+import copy
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 
-# Try to load environment variables from .env file if present
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+# pydantic-core ships with the SDK and parses/serializes JSON natively,
+# several times faster than the stdlib json module
+from pydantic_core import from_json, to_json
 
 # Import BReact SDK
 from breactsdk.client import create_client
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured in main() when run as a script, so importing the
+# workflow leaves the host application's logging setup untouched
 logger = logging.getLogger("EmailManagementWorkflow")
 
+@dataclass(slots=True)
+class EmailMessage:
+    """
+    A single message of an email thread.
+    
+    Threads can be given as lists of EmailMessage instead of dicts; each message then
+    takes a fraction of the memory of a dict, which adds up when many threads are
+    held at once. The SDK serializes both forms to the same JSON.
+    """
+    sender: str
+    recipient: str
+    subject: str
+    content: str
+    timestamp: str
+
+# An email thread, with messages given as EmailMessage instances or plain dicts
+EmailThread = Sequence[Union[EmailMessage, Dict[str, Any]]]
+
+def _message_content(message: Union[EmailMessage, Dict[str, Any]]) -> str:
+    """Return the content of a message given as an EmailMessage or a dict."""
+    return message.content if isinstance(message, EmailMessage) else message["content"]
+
+def _read_json_file(path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return from_json(f.read())
+
+def _write_json_file(path: str, data: Any) -> None:
+    """Serialize data to an indented JSON file."""
+    with open(path, 'wb') as f:
+        f.write(to_json(data, indent=2))
+
+def _read_thread_line(src) -> Optional[Any]:
+    """Parse the next non-blank line of a JSON Lines file, or return None at end of file."""
+    for line in src:
+        if line.strip():
+            return from_json(line)
+    return None
+
+def _write_result_line(dst, result: Any) -> None:
+    """Serialize a result as one line of a JSON Lines file."""
+    dst.write(to_json(result) + b"\n")
+
+_DOTENV_LOADED = False
+
+def _ensure_env():
+    """Load environment variables from a .env file if present, at most once per process."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    _DOTENV_LOADED = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+# Classes used when the caller does not supply classification types
+_DEFAULT_CLASSIFICATION_TYPES: Tuple[str, ...] = ("inquiry", "complaint", "support", "feedback", "sales")
+
+# Analyses requested from the email_response service for every thread
+_ANALYSIS_TYPES: Tuple[str, ...] = ("sentiment", "key_points", "action_items", "response_urgency")
+
+@functools.lru_cache(maxsize=32)
+def _shared_style_guide(tone: str, priority: str) -> Dict[str, str]:
+    """Return the shared style guide dict for a string tone and priority."""
+    return {
+        "tone": tone,
+        "priority": priority
+    }
+
+def _style_guide(tone: str, priority: Any) -> Dict[str, Any]:
+    """
+    Return the style guide for a tone and priority.
+    
+    There are only a handful of string combinations, so one dict per pair is reused
+    across calls; the SDK only serializes it, and callers must not modify it. The
+    priority comes from the analysis response and may not be a string (or even
+    hashable), in which case a fresh dict is built.
+    """
+    if isinstance(tone, str) and isinstance(priority, str):
+        return _shared_style_guide(tone, priority)
+    return {
+        "tone": tone,
+        "priority": priority
+    }
+
+# Number of classification results kept for repeated email content
+_CLASSIFICATION_CACHE_SIZE = 4096
+
 class EmailManagementWorkflow:
     """A workflow that analyzes, classifies, and generates responses to emails using BReact OS services."""
     
     def __init__(self):
         """Initialize the workflow."""
         self.client = None
+        # LRU of classifier results keyed by (classification types, content digest)
+        self._classification_cache: "collections.OrderedDict[Tuple[Tuple[str, ...], bytes], Dict[str, Any]]" = (
+            collections.OrderedDict()
+        )
         
     async def setup(self):
-        """Set up the workflow, create client connection."""
+        """
+        Set up the workflow, create client connection.
+
+        The client is created once and reused for every email processed by this
+        workflow, so its pooled connections stay warm across calls.
+        """
         logger.info("Setting up EmailManagementWorkflow")
-        self.client = create_client(async_client=True)
+        _ensure_env()
+        if self.client is None:
+            self.client = create_client(async_client=True)
         return self
+
+    async def close(self):
+        """Close the client connection."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    async def __aenter__(self):
+        """Support async context manager, setting up the workflow if needed."""
+        return await self.setup()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Support async context manager."""
+        await self.close()
     
-    async def process_email(self, email_thread: List[Dict[str, Any]], 
-                           classification_types: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def process_email(self, email_thread: EmailThread, 
+                           classification_types: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Process an email thread to analyze, classify, and generate a response.
         
         Args:
-            email_thread: List of email messages in the thread, with each message containing
-                          sender, recipient, subject, content, and timestamp fields
-            classification_types: Optional list of classification types to use
-                                 (defaults to ["inquiry", "complaint", "support", "feedback", "sales"])
+            email_thread: List of email messages in the thread, each an EmailMessage or a dict
+                          containing sender, recipient, subject, content, and timestamp fields
+            classification_types: Optional sequence of classification types to use, preferably
+                                 a tuple so it is used as-is for cache keys
+                                 (defaults to _DEFAULT_CLASSIFICATION_TYPES)
         
         Returns:
             Dictionary containing analysis, classification, and suggested response
         """
-        if not classification_types:
-            classification_types = ["inquiry", "complaint", "support", "feedback", "sales"]
+        # tuple() returns tuples unchanged, so callers passing one avoid a copy
+        classification_types = tuple(classification_types) if classification_types else _DEFAULT_CLASSIFICATION_TYPES
             
         logger.info(f"Processing email thread with {len(email_thread)} messages")
+        content = _message_content(email_thread[-1])
         
-        # Step 1: Analyze the email thread
-        logger.info("Analyzing email thread")
-        print(f"[DEBUG] Sending to analyze_thread: {json.dumps(email_thread, indent=2)}")
-        analysis = await self.client.email_response.analyze_thread(
-            email_thread=email_thread,
-            analysis_type=["sentiment", "key_points", "action_items", "response_urgency"]
+        # Steps 1 and 2: Analyze the email thread and classify the email type.
+        # Neither depends on the other, so run them concurrently.
+        logger.info("Analyzing and classifying email thread")
+        logger.debug("Sending to analyze_thread: %s", email_thread)
+        logger.debug("Sending to classifier: content=%.100s... context={'allowedClasses': %s}",
+                     content, classification_types)
+        analysis, classification = await asyncio.gather(
+            self.client.email_response.analyze_thread(
+                email_thread=email_thread,
+                analysis_type=_ANALYSIS_TYPES
+            ),
+            self._classify(content, classification_types)
         )
-        print(f"[DEBUG] Received from analyze_thread: {json.dumps(analysis, indent=2)}")
-        logger.info(f"Email analysis completed: {json.dumps(analysis, indent=2)}")
-        
-        # Step 2: Classify the email type
-        logger.info("Classifying email")
-        print(f"[DEBUG] Sending to classifier: content={email_thread[-1]['content'][:100]}... context={{'allowedClasses': {classification_types}}}")
-        classification = await self.client.classifier.process(
-            content=email_thread[-1]["content"],
-            context={
-                "allowedClasses": classification_types
-            }
-        )
-        print(f"[DEBUG] Received from classifier: {json.dumps(classification, indent=2)}")
-        
-        # Debug the classification structure
-        print(f"[DEBUG] Classification raw: {classification}")
-        print(f"[DEBUG] Result key exists: {'result' in classification}")
-        if 'result' in classification:
-            print(f"[DEBUG] Result type: {type(classification['result'])}")
-            print(f"[DEBUG] Result value: {classification['result']}")
-            print(f"[DEBUG] Result.result exists: {'result' in classification['result']}")
-            if 'result' in classification['result']:
-                print(f"[DEBUG] Result.result type: {type(classification['result']['result'])}")
-                print(f"[DEBUG] Result.result value: {classification['result']['result']}")
-                print(f"[DEBUG] Result.result.class exists: {'class' in classification['result']['result']}")
-                if 'class' in classification['result']['result']:
-                    print(f"[DEBUG] Found class: {classification['result']['result']['class']}")
+        logger.info("Email analysis completed")
+        logger.debug("Received from analyze_thread: %s", analysis)
+        logger.debug("Received from classifier: %r", classification)
         
         # Extract class value correctly
         class_value = classification.get('result', {}).get('class', 'unknown')
@@ -113,15 +207,13 @@ class EmailManagementWorkflow:
         # Determine priority based on urgency analysis
         priority = analysis.get("analysis", {}).get("response_urgency", "medium")
         
-        print(f"[DEBUG] Sending to generate_response: email_thread={json.dumps(email_thread[:10], indent=2)}, style_guide={{'tone': '{tone}', 'priority': '{priority}'}}")
+        logger.debug("Sending to generate_response: thread_len=%d tone=%s priority=%s",
+                     len(email_thread), tone, priority)
         response = await self.client.email_response.generate_response(
             email_thread=email_thread,
-            style_guide={
-                "tone": tone,
-                "priority": priority
-            }
+            style_guide=_style_guide(tone, priority)
         )
-        print(f"[DEBUG] Received from generate_response: {json.dumps(response, indent=2)}")
+        logger.debug("Received from generate_response: %s", response)
         
         logger.info("Email response generated successfully")
         
@@ -131,6 +223,84 @@ class EmailManagementWorkflow:
             "suggested_response": response
         }
     
+    async def _classify(self, content: str, classification_types: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Classify email content, reusing the result for content classified before.
+        
+        Autoresponders and template replies repeat the same content, so results are
+        kept in an LRU cache keyed by the classification types and a BLAKE2b digest
+        of the content. The types tuple is used as-is, without sorting. Tuples do
+        not cache their hash, so each lookup rehashes it in time linear in the
+        number of classes; the class strings cache their own hashes, which keeps
+        this negligible next to the classifier call.
+        Each call returns its own copy, so callers may modify the result freely.
+        """
+        key = (classification_types, hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest())
+        cached = self._classification_cache.get(key)
+        if cached is not None:
+            self._classification_cache.move_to_end(key)
+            logger.debug("Classification cache hit")
+            return copy.deepcopy(cached)
+        
+        classification = await self.client.classifier.process(
+            content=content,
+            context={
+                "allowedClasses": classification_types
+            }
+        )
+        self._classification_cache[key] = copy.deepcopy(classification)
+        if len(self._classification_cache) > _CLASSIFICATION_CACHE_SIZE:
+            self._classification_cache.popitem(last=False)
+        return classification
+    
+    async def process_batch(self, threads: Sequence[EmailThread], concurrency: int = 8,
+                            classification_types: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Process many email threads with a bounded pool of concurrent workers.
+        
+        Args:
+            threads: List of email threads, each in the format accepted by process_email
+            concurrency: Maximum number of threads processed at the same time
+            classification_types: Optional list of classification types to use for every thread
+        
+        Returns:
+            Processing results, in the same order as the input threads
+        
+        Raises:
+            ValueError: If concurrency is less than 1
+            ExceptionGroup: If processing any thread fails; the remaining workers are
+                            cancelled and the original exceptions are wrapped in the group
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        logger.info(f"Processing batch of {len(threads)} email threads with concurrency {concurrency}")
+        
+        # Normalize once so every thread shares the same tuple
+        if classification_types:
+            classification_types = tuple(classification_types)
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(threads):
+            queue.put_nowait(item)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(threads)
+        
+        async def worker():
+            # The queue is filled up front, so a worker stops once it is drained
+            while True:
+                try:
+                    index, thread = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[index] = await self.process_email(thread, classification_types)
+        
+        # TaskGroup cancels the remaining workers if any thread fails
+        async with asyncio.TaskGroup() as group:
+            for _ in range(min(concurrency, len(threads))):
+                group.create_task(worker())
+        
+        return results
+    
     async def process_from_file(self, input_file: str, output_file: Optional[str] = None) -> Dict[str, Any]:
         """
         Process an email thread from a JSON file and optionally save results to an output file.
@@ -145,8 +315,9 @@ class EmailManagementWorkflow:
         logger.info(f"Processing email thread from file: {input_file}")
         
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Read and write in a worker thread so the event loop keeps serving
+            # other in-flight requests during file I/O and JSON parsing
+            data = await asyncio.to_thread(_read_json_file, input_file)
                 
             if not isinstance(data, list):
                 raise ValueError("Input file must contain a list of email messages")
@@ -155,26 +326,89 @@ class EmailManagementWorkflow:
             
             if output_file:
                 logger.info(f"Saving results to: {output_file}")
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2)
+                await asyncio.to_thread(_write_json_file, output_file, results)
                     
             return results
             
         except Exception as e:
             logger.error(f"Error processing email from file: {str(e)}")
             raise
+    
+    async def process_archive(self, input_file: str, output_file: str, concurrency: int = 8) -> int:
+        """
+        Stream an archive of email threads through the workflow.
+        
+        The input is a JSON Lines file with one email thread per line; results are
+        written to the output file as JSON Lines in the same order. Threads are read
+        and results written incrementally, so at most `concurrency` threads are held
+        in memory regardless of the archive size.
+        
+        Args:
+            input_file: Path to input JSON Lines file, one email thread per line
+            output_file: Path to output JSON Lines file for results
+            concurrency: Maximum number of threads processed at the same time
+            
+        Returns:
+            Number of threads processed
+        
+        Raises:
+            ValueError: If concurrency is less than 1 or a line is not a list of email messages
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        logger.info(f"Processing email archive from file: {input_file}")
+        
+        pending: collections.deque = collections.deque()
+        count = 0
+        try:
+            with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
+                # As in process_from_file, reading, parsing and writing run in a worker
+                # thread so in-flight threads keep making progress during file I/O
+                while (thread := await asyncio.to_thread(_read_thread_line, src)) is not None:
+                    if not isinstance(thread, list):
+                        raise ValueError("Each archive line must contain a list of email messages")
+                    if len(pending) >= concurrency:
+                        # Write the oldest result before admitting another thread
+                        await asyncio.to_thread(_write_result_line, dst, await pending.popleft())
+                        count += 1
+                    pending.append(asyncio.ensure_future(self.process_email(thread)))
+                while pending:
+                    await asyncio.to_thread(_write_result_line, dst, await pending.popleft())
+                    count += 1
+        except Exception as e:
+            logger.error(f"Error processing email archive: {str(e)}")
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+            # Retrieve the outcome of every abandoned task so failures that were
+            # not yet at the head of the queue are not reported as never retrieved
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        logger.info(f"Saved {count} results to: {output_file}")
+        return count
             
 async def main():
     """Main function to run the workflow from command line."""
+    # CLI-only imports stay here so importing the workflow as a module stays cheap
+    import argparse
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     parser = argparse.ArgumentParser(description="Email Management Workflow")
-    parser.add_argument("--input", "-i", help="Input JSON file containing email thread")
+    parser.add_argument("--input", "-i", help="Input JSON file containing email thread, or .jsonl archive of threads")
     parser.add_argument("--output", "-o", help="Output file for results (optional)")
     parser.add_argument("--example", "-e", action="store_true", help="Generate example email thread JSON")
     
     args = parser.parse_args()
     
     if args.example:
-        # Generate an example email thread JSON file
+        # Generate an example email thread JSON file; the fixed timestamp keeps
+        # the output reproducible
         example_file = "example_email_thread.json"
         example_thread = [
             {
@@ -182,12 +416,11 @@ async def main():
                 "recipient": "support@company.com",
                 "subject": "Issue with recent order #12345",
                 "content": "Hello,\n\nI placed an order (#12345) three days ago and still haven't received a shipping confirmation. According to your website, it should have shipped by now. Can you please check on this and let me know the status?\n\nThanks,\nJohn",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": "2024-01-15T10:30:00"
             }
         ]
         
-        with open(example_file, 'w', encoding='utf-8') as f:
-            json.dump(example_thread, f, indent=2)
+        _write_json_file(example_file, example_thread)
             
         print(f"Example email thread saved to: {example_file}")
         return
@@ -195,13 +428,20 @@ async def main():
     if not args.input:
         parser.print_help()
         return
+    
+    if args.input.endswith(".jsonl"):
+        if not args.output:
+            parser.error("--output is required when processing a .jsonl archive")
+        async with EmailManagementWorkflow() as workflow:
+            await workflow.process_archive(args.input, args.output)
+        return
         
-    workflow = await EmailManagementWorkflow().setup()
-    results = await workflow.process_from_file(args.input, args.output)
+    async with EmailManagementWorkflow() as workflow:
+        results = await workflow.process_from_file(args.input, args.output)
     
     if not args.output:
         # Print results to console if no output file specified
-        print(json.dumps(results, indent=2))
+        print(to_json(results, indent=2).decode())
     
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -17,7 +17,7 @@ setup(
         "aiohttp>=3.8.0",
         "pydantic>=2.0.0",
         "python-dotenv>=1.0.0",
-        "httpx>=0.24.0"
+        "httpx[http2]>=0.24.0"
     ],
     author="BReact OS Team",
     author_email="office@breact.ai",